@@ -1,18 +1,49 @@
 from fastapi import FastAPI, Body, HTTPException
 import sqlite3
-import pandas as pd
-import numpy as np
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
-import uuid
+from fastapi.responses import ORJSONResponse
+import secrets
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 import os
 import hashlib
+import random
+import threading
 
 # Timezone for daily puzzle reset (Eastern Time)
 EST = ZoneInfo("America/New_York")
 
-app = FastAPI()
+# How often stale sessions are purged, in seconds
+CLEANUP_INTERVAL = 300
+
+logger = logging.getLogger(__name__)
+
+
+async def cleanup_loop():
+    """Periodically purge old sessions off the request path"""
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            await loop.run_in_executor(None, cleanup_old_sessions)
+        except Exception:
+            logger.exception("Session cleanup failed")
+        await asyncio.sleep(CLEANUP_INTERVAL)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    cleanup_task = asyncio.create_task(cleanup_loop())
+    yield
+    cleanup_task.cancel()
+    # Don't lose access times recorded since the last cleanup
+    flush_session_touches(get_conn())
+
+
+# orjson serializes the season lists considerably faster than stdlib json
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Use environment variable for allowed origins
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000").split(",")
@@ -28,116 +59,295 @@ DB_PATH = os.getenv("DB_PATH", "football_wordle.db")
 
 # Database Setup
 
+# One long-lived connection per worker thread, so SQLite's page cache
+# survives between requests instead of being rebuilt on every connect
+_thread_local = threading.local()
+
+def get_conn():
+    """Get this thread's shared connection, opening and configuring it on first use"""
+    conn = getattr(_thread_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(
+            DB_PATH,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA wal_autocheckpoint=1000")
+        conn.execute("PRAGMA cache_size=-64000")  # ~64 MB
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MB, well above the DB size
+        _thread_local.conn = conn
+    return conn
+
+
 def init_sessions_table():
     """Create sessions table if it doesn't exist and migrate if needed"""
-    with sqlite3.connect(DB_PATH) as conn:
-        # Create table if it doesn't exist
+    conn = get_conn()
+    # Create table if it doesn't exist
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS game_sessions (
+            session_id TEXT PRIMARY KEY,
+            player_id INTEGER NOT NULL,
+            game_mode TEXT NOT NULL DEFAULT 'unlimited',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_accessed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (player_id) REFERENCES players(id)
+        )
+    """)
+        
+    # Check if game_mode column exists and add it if it doesn't
+    cursor = conn.execute("PRAGMA table_info(game_sessions)")
+    columns = [row[1] for row in cursor.fetchall()]
+        
+    if 'game_mode' not in columns:
         conn.execute("""
-            CREATE TABLE IF NOT EXISTS game_sessions (
-                session_id TEXT PRIMARY KEY,
-                player_id INTEGER NOT NULL,
-                game_mode TEXT NOT NULL DEFAULT 'unlimited',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_accessed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (player_id) REFERENCES players(id)
+            ALTER TABLE game_sessions 
+            ADD COLUMN game_mode TEXT NOT NULL DEFAULT 'unlimited'
+        """)
+
+
+def init_indexes():
+    """Create lookup indexes on the stats tables if they don't exist"""
+    conn = get_conn()
+    # Season fetches filter on player_id and order by season, id; the
+    # index's implicit rowid tail serves that order without a sort
+    for table in ("passing_seasons", "receiving_seasons", "rushing_seasons"):
+        conn.execute(f"DROP INDEX IF EXISTS idx_{table}_player")
+        conn.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_{table}_player_season
+            ON {table} (player_id, season)
+        """)
+    
+    # Case-insensitive name lookups for guesses compare with NOCASE
+    conn.execute("DROP INDEX IF EXISTS idx_players_name_lower")
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_players_name_nocase
+        ON players (name COLLATE NOCASE)
+    """)
+    
+    # Refresh planner statistics so the new indexes get picked up
+    conn.execute("ANALYZE")
+
+
+def init_player_search():
+    """Create and rebuild the full-text index used by autocomplete"""
+    conn = get_conn()
+    # Trigram tokens let LIKE '%q%' substring matches use the index
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS players_fts USING fts5(
+            name, content='players', content_rowid='id', tokenize='trigram'
+        )
+    """)
+    
+    # Rebuilt on every startup like player_summary, so the index catches up
+    # even if an ingest recreated players and dropped the triggers below
+    conn.execute("INSERT INTO players_fts(players_fts) VALUES ('rebuild')")
+    
+    # Keep the index in sync with writes while the app is running
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS players_fts_insert AFTER INSERT ON players BEGIN
+            INSERT INTO players_fts (rowid, name) VALUES (new.id, new.name);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS players_fts_delete AFTER DELETE ON players BEGIN
+            INSERT INTO players_fts (players_fts, rowid, name)
+            VALUES ('delete', old.id, old.name);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS players_fts_update AFTER UPDATE ON players BEGIN
+            INSERT INTO players_fts (players_fts, rowid, name)
+            VALUES ('delete', old.id, old.name);
+            INSERT INTO players_fts (rowid, name) VALUES (new.id, new.name);
+        END
+    """)
+
+
+def init_player_summary():
+    """Rebuild the per-player summary table from the stats tables"""
+    conn = get_conn()
+    # Stats only change on ingest, so rebuilding on startup keeps this
+    # current; only players with at least one season are included. The
+    # table is recreated rather than emptied so column changes apply too.
+    try:
+        conn.execute("BEGIN")
+        conn.execute("DROP TABLE IF EXISTS player_summary")
+        conn.execute("""
+            CREATE TABLE player_summary (
+                id INTEGER PRIMARY KEY,
+                name TEXT,
+                first_season INTEGER,
+                teams TEXT,
+                FOREIGN KEY (id) REFERENCES players(id)
             )
         """)
-        
-        # Check if game_mode column exists and add it if it doesn't
-        cursor = conn.execute("PRAGMA table_info(game_sessions)")
-        columns = [row[1] for row in cursor.fetchall()]
-        
-        if 'game_mode' not in columns:
-            conn.execute("""
-                ALTER TABLE game_sessions 
-                ADD COLUMN game_mode TEXT NOT NULL DEFAULT 'unlimited'
-            """)
-        
-        conn.commit()
+        conn.execute("""
+            INSERT INTO player_summary (id, name, first_season, teams)
+            SELECT p.id, p.name, MIN(s.season), GROUP_CONCAT(DISTINCT s.team)
+            FROM players p
+            JOIN (
+                SELECT player_id, season, team FROM passing_seasons
+                UNION ALL
+                SELECT player_id, season, team FROM receiving_seasons
+                UNION ALL
+                SELECT player_id, season, team FROM rushing_seasons
+            ) s ON s.player_id = p.id
+            GROUP BY p.id
+        """)
+        conn.execute("COMMIT")
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
 
 # Initialize on startup
 init_sessions_table()
+init_indexes()
+init_player_search()
+init_player_summary()
+
+
+# Queries
+# Kept as module-level constants so every call submits the exact same SQL
+# text and hits the connection's prepared statement cache
+
+SQL_GET_POSITION = "SELECT position FROM players WHERE id = ?"
+
+SQL_VALID_PLAYER_IDS = "SELECT id FROM player_summary ORDER BY id"
+
+SQL_PLAYER_BY_ID = "SELECT name, pfr_id, position FROM players WHERE id = ?"
+
+SQL_QB_SEASONS = """
+    SELECT season, team, games, games_started,
+           completions, attempts, yards,
+           touchdowns, interceptions,
+           passer_rating, awards
+    FROM passing_seasons
+    WHERE player_id = ?
+    ORDER BY season, id
+"""
+
+SQL_WR_SEASONS = """
+    SELECT season, team, games, targets, receptions,
+           yards, yards_per_reception, touchdowns, awards
+    FROM receiving_seasons
+    WHERE player_id = ?
+    ORDER BY season, id
+"""
+
+SQL_RB_SEASONS = """
+    SELECT season, team, games,
+           attempts, yards, yards_per_attempt, touchdowns,
+           receptions, receiving_yards, awards
+    FROM rushing_seasons
+    WHERE player_id = ?
+    ORDER BY season, id
+"""
+
+# Resolves the session's answer and the guessed player (by name) and
+# returns both players' first season and teams in a single row
+SQL_GUESS_LOOKUP = """
+    SELECT s.player_id,
+           g.id, g.pfr_id, gs.first_season, gs.teams,
+           a.first_season, a.teams
+    FROM game_sessions s
+    LEFT JOIN player_summary a ON a.id = s.player_id
+    LEFT JOIN players g ON g.name = ? COLLATE NOCASE
+    LEFT JOIN player_summary gs ON gs.id = g.id
+    WHERE s.session_id = ?
+    ORDER BY g.id
+    LIMIT 1
+"""
+
+SQL_CREATE_SESSION = """
+    INSERT INTO game_sessions (session_id, player_id, game_mode, created_at, last_accessed)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+SQL_SESSION_PLAYER = """
+    SELECT player_id FROM game_sessions
+    WHERE session_id = ?
+"""
+
+SQL_TOUCH_SESSION = """
+    UPDATE game_sessions
+    SET last_accessed = ?
+    WHERE session_id = ?
+"""
+
+SQL_CLEANUP_SESSIONS = """
+    DELETE FROM game_sessions
+    WHERE last_accessed < ?
+    AND created_at < ?
+"""
+
+SQL_AUTOCOMPLETE = """
+    SELECT DISTINCT name
+    FROM player_summary
+    WHERE id IN (SELECT rowid FROM players_fts WHERE name LIKE ?)
+    ORDER BY name
+    LIMIT 10
+"""
 
 
 # Helpers
 
-def clean_nan(obj):
-    if isinstance(obj, dict):
-        return {k: clean_nan(v) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [clean_nan(v) for v in obj]
-    if obj is None:
-        return None
-    if isinstance(obj, float) and np.isnan(obj):
-        return None
-    return obj
-
-
 def get_player_position(conn, player_id):
     """Get a player's position"""
-    cursor = conn.execute(
-        "SELECT position FROM players WHERE id = ?",
-        (player_id,)
-    )
+    cursor = conn.execute(SQL_GET_POSITION, (player_id,))
     row = cursor.fetchone()
     return row[0] if row else None
 
 
-def get_all_valid_players(conn):
-    """Get all valid players (QBs, WRs, or RBs with stats)"""
-    return pd.read_sql(
-        """
-        SELECT DISTINCT p.id, p.position
-        FROM players p
-        WHERE EXISTS (SELECT 1 FROM passing_seasons ps WHERE ps.player_id = p.id)
-           OR EXISTS (SELECT 1 FROM receiving_seasons rs WHERE rs.player_id = p.id)
-           OR EXISTS (SELECT 1 FROM rushing_seasons rus WHERE rus.player_id = p.id)
-        """,
-        conn,
-    )
+# Stats tables only change on ingest, so the valid player ids are kept in
+# memory as (loaded_at, ids) and reloaded at most once an hour
+VALID_PLAYERS_TTL = 3600
+_valid_ids_cache = None
+
+def get_valid_player_ids(conn):
+    """Get the ids of all valid players (QBs, WRs, or RBs with stats)"""
+    global _valid_ids_cache
+    
+    now = datetime.now()
+    if _valid_ids_cache is not None:
+        loaded_at, player_ids = _valid_ids_cache
+        if (now - loaded_at).total_seconds() < VALID_PLAYERS_TTL:
+            return player_ids
+    
+    player_ids = [row[0] for row in conn.execute(SQL_VALID_PLAYER_IDS)]
+    _valid_ids_cache = (now, player_ids)
+    return player_ids
 
 
+# Today's pick as (date, player_id), so the lookup only runs once per day
+_daily_cache = None
+
 def get_daily_player_id(conn):
     """Get a deterministic player ID based on today's date in EST"""
+    global _daily_cache
+    
     today = datetime.now(EST).date().isoformat()
+    if _daily_cache is not None and _daily_cache[0] == today:
+        return _daily_cache[1]
     
     # Create a hash from the date to get a consistent random seed
     seed = int(hashlib.md5(today.encode()).hexdigest(), 16) % (2**31)
     
     # Get all valid player IDs (both QBs and WRs)
-    player_df = get_all_valid_players(conn)
+    player_ids = get_valid_player_ids(conn)
     
-    if player_df.empty:
+    if not player_ids:
         return None
     
-    # Use numpy with the seed to select a consistent player for today
-    np.random.seed(seed)
-    idx = np.random.randint(0, len(player_df))
-    
-    return int(player_df.iloc[idx]["id"])
-
-
-def get_player_by_name(conn, name):
-    df = pd.read_sql(
-        """
-        SELECT id, name, pfr_id, position
-        FROM players
-        WHERE LOWER(name) = LOWER(?)
-        LIMIT 1
-        """,
-        conn,
-        params=(name,),
-    )
-
-    if df.empty:
-        return None
-
-    return {
-        "id": int(df.iloc[0]["id"]),
-        "name": df.iloc[0]["name"],
-        "pfr_id": df.iloc[0]["pfr_id"],
-        "position": df.iloc[0]["position"]
-    }
+    # Use a seeded generator to select a consistent player for today
+    rng = random.Random(seed)
+    player_id = player_ids[rng.randrange(len(player_ids))]
+    _daily_cache = (today, player_id)
+    return player_id
 
 
 def get_player_seasons(conn, player_id):
@@ -145,167 +355,109 @@ def get_player_seasons(conn, player_id):
     position = get_player_position(conn, player_id)
     
     if position == "QB":
-        seasons = pd.read_sql(
-            """
-            SELECT season, team, games, games_started,
-                   completions, attempts, yards,
-                   touchdowns, interceptions,
-                   passer_rating, awards
-            FROM passing_seasons
-            WHERE player_id = ?
-            ORDER BY season
-            """,
-            conn,
-            params=(player_id,),
-        )
+        cursor = conn.execute(SQL_QB_SEASONS, (player_id,))
     elif position == "WR":
-        seasons = pd.read_sql(
-            """
-            SELECT season, team, games, targets, receptions,
-                   yards, yards_per_reception, touchdowns, awards
-            FROM receiving_seasons
-            WHERE player_id = ?
-            ORDER BY season
-            """,
-            conn,
-            params=(player_id,),
-        )
+        cursor = conn.execute(SQL_WR_SEASONS, (player_id,))
     else:  # RB
-        seasons = pd.read_sql(
-            """
-            SELECT season, team, games,
-                   attempts, yards, yards_per_attempt, touchdowns,
-                   receptions, receiving_yards, awards
-            FROM rushing_seasons
-            WHERE player_id = ?
-            ORDER BY season
-            """,
-            conn,
-            params=(player_id,),
-        )
+        cursor = conn.execute(SQL_RB_SEASONS, (player_id,))
     
-    seasons = seasons.where(pd.notnull(seasons), None)
+    # SQLite stores NaN as NULL, so missing stats already come back as None
+    columns = [col[0] for col in cursor.description]
+    seasons = [dict(zip(columns, row)) for row in cursor]
     return seasons, position
 
 
-def get_player_era(conn, player_id):
-    """Get a player's era (first and last season) from any stats table"""
-    df = pd.read_sql(
-        """
-        SELECT MIN(season) AS start, MAX(season) AS end
-        FROM (
-            SELECT season FROM passing_seasons WHERE player_id = ?
-            UNION ALL
-            SELECT season FROM receiving_seasons WHERE player_id = ?
-            UNION ALL
-            SELECT season FROM rushing_seasons WHERE player_id = ?
-        )
-        """,
-        conn,
-        params=(player_id, player_id, player_id),
-    )
-    
-    start = df.iloc[0]["start"]
-    end = df.iloc[0]["end"]
+def parse_teams(teams):
+    """Split a GROUP_CONCAT'd team list into a set"""
+    return set(teams.split(",")) if teams else set()
+
+
+def get_guess_lookup(conn, session_id, guess_name):
+    """Get the session's player and the guessed player's era and teams in one query"""
+    # No row means no such session; guessed columns are NULL if the name is unknown
+    row = conn.execute(SQL_GUESS_LOOKUP, (guess_name, session_id)).fetchone()
+    if row is None:
+        return None
     
-    if start is None or end is None:
-        return None, None
+    record_session_access(session_id)
     
-    return int(start), int(end)
-
-
-def get_player_teams(conn, player_id):
-    """Get all teams a player has played for from any stats table"""
-    df = pd.read_sql(
-        """
-        SELECT DISTINCT team FROM (
-            SELECT team FROM passing_seasons WHERE player_id = ?
-            UNION
-            SELECT team FROM receiving_seasons WHERE player_id = ?
-            UNION
-            SELECT team FROM rushing_seasons WHERE player_id = ?
-        )
-        """,
-        conn,
-        params=(player_id, player_id, player_id),
+    answer_id, guessed_id, pfr_id, guess_start, guess_teams, answer_start, answer_teams = row
+    return (
+        answer_id, guessed_id, pfr_id,
+        guess_start, parse_teams(guess_teams),
+        answer_start, parse_teams(answer_teams),
     )
 
-    return set(df["team"].dropna().tolist())
-
 
 def create_session(conn, player_id, game_mode="unlimited"):
-    """Create a new game session with immediate commit"""
-    session_id = str(uuid.uuid4())
+    """Create a new game session (written immediately in autocommit mode)"""
+    session_id = secrets.token_urlsafe(16)
     now = datetime.now()
-    conn.execute(
-        """
-        INSERT INTO game_sessions (session_id, player_id, game_mode, created_at, last_accessed)
-        VALUES (?, ?, ?, ?, ?)
-        """,
-        (session_id, player_id, game_mode, now, now)
-    )
-    conn.commit()
+    conn.execute(SQL_CREATE_SESSION, (session_id, player_id, game_mode, now, now))
     return session_id
 
 
+# last_accessed only matters to cleanup, so session touches are held in
+# memory and written in one batch right before cleanup runs
+_pending_touches = {}
+_pending_touches_lock = threading.Lock()
+
 def get_session_player(conn, session_id):
-    """Get the player_id for a session"""
-    cursor = conn.execute(
-        """
-        SELECT player_id FROM game_sessions
-        WHERE session_id = ?
-        """,
-        (session_id,)
-    )
-    
-    row = cursor.fetchone()
+    """Get the player_id for a session and record it as accessed"""
+    row = conn.execute(SQL_SESSION_PLAYER, (session_id,)).fetchone()
     if row is None:
         return None
     
-    # Update last accessed time
-    conn.execute(
-        """
-        UPDATE game_sessions
-        SET last_accessed = ?
-        WHERE session_id = ?
-        """,
-        (datetime.now(), session_id)
-    )
-    conn.commit()
-    
+    record_session_access(session_id)
     return row[0]
 
 
-# Track last cleanup time to avoid running too frequently
-_last_cleanup_time = None
+def record_session_access(session_id):
+    """Queue a last_accessed update for a session"""
+    with _pending_touches_lock:
+        _pending_touches[session_id] = datetime.now()
 
-def cleanup_old_sessions():
-    """Remove sessions older than 72 hours, but only run cleanup every 5 minutes max"""
-    global _last_cleanup_time
+
+def flush_session_touches(conn):
+    """Write pending last_accessed updates to the sessions table"""
+    global _pending_touches
     
-    now = datetime.now()
-    # Only run cleanup if it's been at least 5 minutes since last cleanup
-    if _last_cleanup_time is not None:
-        time_since_cleanup = (now - _last_cleanup_time).total_seconds()
-        if time_since_cleanup < 300:  # 5 minutes
-            return
+    with _pending_touches_lock:
+        touches, _pending_touches = _pending_touches, {}
     
-    _last_cleanup_time = now
+    if not touches:
+        return
     
-    with sqlite3.connect(DB_PATH) as conn:
-        # Delete sessions older than 72 hours
-        cutoff = datetime.now() - timedelta(hours=72)
-        # Safety: Never delete sessions less than 2 hours old, even if they appear "old"
-        min_age = datetime.now() - timedelta(hours=2)
-        conn.execute(
-            """
-            DELETE FROM game_sessions
-            WHERE last_accessed < ?
-            AND created_at < ?
-            """,
-            (cutoff, min_age)
+    try:
+        conn.execute("BEGIN")
+        conn.executemany(
+            SQL_TOUCH_SESSION,
+            [(accessed, session_id) for session_id, accessed in touches.items()]
         )
-        conn.commit()
+        conn.execute("COMMIT")
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        # Put the touches back for the next flush, keeping any newer ones
+        with _pending_touches_lock:
+            for session_id, accessed in touches.items():
+                newer = _pending_touches.get(session_id)
+                if newer is None or newer < accessed:
+                    _pending_touches[session_id] = accessed
+        raise
+
+
+def cleanup_old_sessions():
+    """Remove sessions older than 72 hours (run periodically by cleanup_loop)"""
+    conn = get_conn()
+    # Bring last_accessed up to date before deciding what is stale
+    flush_session_touches(conn)
+    
+    # Delete sessions older than 72 hours
+    cutoff = datetime.now() - timedelta(hours=72)
+    # Safety: Never delete sessions less than 2 hours old, even if they appear "old"
+    min_age = datetime.now() - timedelta(hours=2)
+    conn.execute(SQL_CLEANUP_SESSIONS, (cutoff, min_age))
 
 
 # ----------------------
@@ -327,59 +479,51 @@ def health_check():
 def daily_qb():
     """Start a daily game session with today's player (QB or WR)"""
     
-    cleanup_old_sessions()
-    
-    with sqlite3.connect(DB_PATH) as conn:
-        player_id = get_daily_player_id(conn)
+    conn = get_conn()
+    player_id = get_daily_player_id(conn)
         
-        if player_id is None:
-            raise HTTPException(status_code=500, detail="No playable players found")
+    if player_id is None:
+        raise HTTPException(status_code=500, detail="No playable players found")
         
-        # Create session
-        session_id = create_session(conn, player_id, game_mode="daily")
+    # Create session
+    session_id = create_session(conn, player_id, game_mode="daily")
         
-        # Get seasons based on player position
-        seasons, position = get_player_seasons(conn, player_id)
-        seasons_dict = seasons.to_dict(orient="records")
+    # Get seasons based on player position
+    seasons, position = get_player_seasons(conn, player_id)
 
     return {
         "session_id": session_id,
         "game_mode": "daily",
         "position": position,
-        "seasons": clean_nan(seasons_dict)
+        "seasons": seasons
     }
 
 
 @app.get("/random_qb")
 def random_qb():
     """Start a new game session with a random player (QB or WR)"""
-    import random
-    
-    cleanup_old_sessions()
     
-    with sqlite3.connect(DB_PATH) as conn:
-        # Get all valid players (QBs and WRs)
-        player_df = get_all_valid_players(conn)
+    conn = get_conn()
+    # Get all valid players (QBs and WRs)
+    player_ids = get_valid_player_ids(conn)
 
-        if player_df.empty:
-            raise HTTPException(status_code=500, detail="No playable players found")
+    if not player_ids:
+        raise HTTPException(status_code=500, detail="No playable players found")
 
-        # Truly random selection (not affected by numpy seed)
-        idx = random.randint(0, len(player_df) - 1)
-        player_id = int(player_df.iloc[idx]["id"])
+    # Truly random selection (independent of the daily seed)
+    player_id = random.choice(player_ids)
         
-        # Create session
-        session_id = create_session(conn, player_id, game_mode="unlimited")
+    # Create session
+    session_id = create_session(conn, player_id, game_mode="unlimited")
         
-        # Get seasons based on player position
-        seasons, position = get_player_seasons(conn, player_id)
-        seasons_dict = seasons.to_dict(orient="records")
+    # Get seasons based on player position
+    seasons, position = get_player_seasons(conn, player_id)
 
     return {
         "session_id": session_id,
         "game_mode": "unlimited",
         "position": position,
-        "seasons": clean_nan(seasons_dict)
+        "seasons": seasons
     }
 
 
@@ -396,46 +540,39 @@ def guess_player(payload: dict = Body(...)):
     if not guess_name:
         raise HTTPException(status_code=400, detail="Missing guess")
 
-    with sqlite3.connect(DB_PATH) as conn:
-        # Get the player for this session
-        current_player_id = get_session_player(conn, session_id)
+    conn = get_conn()
+    # Get the session's player and the guessed player together
+    lookup = get_guess_lookup(conn, session_id, guess_name)
         
-        if current_player_id is None:
-            raise HTTPException(
-                status_code=404, 
-                detail="Session not found or expired. Please start a new game."
-            )
+    if lookup is None:
+        raise HTTPException(
+            status_code=404, 
+            detail="Session not found or expired. Please start a new game."
+        )
 
-        guessed_player = get_player_by_name(conn, guess_name)
-        if guessed_player is None:
-            raise HTTPException(status_code=404, detail="Player not found")
-
-        guessed_id = guessed_player["id"]
-        pfr_id = guessed_player["pfr_id"]
-
-        if guessed_id == current_player_id:
-            return {
-                "correct": True,
-                "pfr_id": pfr_id
-            }
-
-        guess_start, guess_end = get_player_era(conn, guessed_id)
-        answer_start, answer_end = get_player_era(conn, current_player_id)
-
-        # Handle case where era couldn't be determined
-        if guess_start is None or answer_start is None:
-            era_feedback = "far"
-        else:
-            era_feedback = (
-                "same"
-                if abs(guess_start - answer_start) <= 2
-                else "far"
-            )
+    (current_player_id, guessed_id, pfr_id,
+     guess_start, guess_teams, answer_start, answer_teams) = lookup
+
+    if guessed_id is None:
+        raise HTTPException(status_code=404, detail="Player not found")
+
+    if guessed_id == current_player_id:
+        return {
+            "correct": True,
+            "pfr_id": pfr_id
+        }
 
-        guess_teams = get_player_teams(conn, guessed_id)
-        answer_teams = get_player_teams(conn, current_player_id)
+    # Handle case where era couldn't be determined
+    if guess_start is None or answer_start is None:
+        era_feedback = "far"
+    else:
+        era_feedback = (
+            "same"
+            if abs(guess_start - answer_start) <= 2
+            else "far"
+        )
 
-        teams_overlap = len(guess_teams & answer_teams) > 0
+    teams_overlap = len(guess_teams & answer_teams) > 0
 
     return {
         "correct": False,
@@ -456,25 +593,23 @@ def reveal(payload: dict = Body(...)):
     if not session_id:
         raise HTTPException(status_code=400, detail="Missing session_id")
 
-    with sqlite3.connect(DB_PATH) as conn:
-        current_player_id = get_session_player(conn, session_id)
+    conn = get_conn()
+    current_player_id = get_session_player(conn, session_id)
         
-        if current_player_id is None:
-            raise HTTPException(
-                status_code=404, 
-                detail="Session not found or expired"
-            )
-        
-        df = pd.read_sql(
-            "SELECT name, pfr_id, position FROM players WHERE id = ?",
-            conn,
-            params=(current_player_id,),
+    if current_player_id is None:
+        raise HTTPException(
+            status_code=404, 
+            detail="Session not found or expired"
         )
+        
+    name, pfr_id, position = conn.execute(
+        SQL_PLAYER_BY_ID, (current_player_id,)
+    ).fetchone()
 
     return {
-        "name": df.iloc[0]["name"],
-        "pfr_id": df.iloc[0]["pfr_id"],
-        "position": df.iloc[0]["position"]
+        "name": name,
+        "pfr_id": pfr_id,
+        "position": position
     }
 
 
@@ -485,22 +620,7 @@ def autocomplete(q: str):
     if not q or len(q) > 100:
         return {"players": []}
     
-    with sqlite3.connect(DB_PATH) as conn:
-        df = pd.read_sql(
-            """
-            SELECT DISTINCT name
-            FROM players
-            WHERE LOWER(name) LIKE LOWER(?)
-            AND (
-                EXISTS (SELECT 1 FROM passing_seasons ps WHERE ps.player_id = players.id)
-                OR EXISTS (SELECT 1 FROM receiving_seasons rs WHERE rs.player_id = players.id)
-                OR EXISTS (SELECT 1 FROM rushing_seasons rus WHERE rus.player_id = players.id)
-            )
-            ORDER BY name
-            LIMIT 10
-            """,
-            conn,
-            params=(f"%{q}%",),
-        )
+    conn = get_conn()
+    rows = conn.execute(SQL_AUTOCOMPLETE, (f"%{q}%",))
 
-    return {"players": df["name"].tolist()}
+    return {"players": [row[0] for row in rows]}